@@ -21,6 +21,7 @@
 from dataclasses import dataclass
 from enum import auto, IntFlag
 import sys
+from typing import Any, ClassVar
 import warnings
 
 IgneaConditions = IntFlag
@@ -41,7 +42,7 @@ class IgneaMeta(type):
         return cls.__name__
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class IgneaPosition:
     """
     Position in a text file.
@@ -64,7 +65,7 @@ class IgneaPosition:
     def __repr__(self) -> str:
         """Returns the representation of the position as a tuple."""
 
-        return repr((self.filename, self.index_, self.line, self.column))
+        return f"({self.filename!r}, {self.index_!r}, {self.line!r}, {self.column!r})"
 
     def __str__(self) -> str:
         """Returns the position in a user-friendly format."""
@@ -91,7 +92,27 @@ class IgneaPosition:
 
 
 class IgneaException(Exception):
-    """Generic exception processing an input file."""
+    """
+    Generic exception processing an input file.
+
+    The message is only formatted when the exception is converted to a
+    string or its `args` are read, so exceptions that are never
+    reported do not pay for it. As with other exceptions, `args` holds
+    the message as its only argument.
+
+    Attributes:
+        _SUFFIX:
+            Suffix appended to the type of the exception when it is
+            converted to a string.
+        _where:
+            Where the exception happened, or None if it is not
+            location-specific.
+        _type: Type of the exception, without `_SUFFIX`.
+        _description: Description of the exception.
+        _message: Message replacing the formatted one, or None.
+    """
+
+    _SUFFIX: ClassVar[str] = ""
 
     def __init__(
         self, where: IgneaPosition | str | None, type_: str, description: str
@@ -107,14 +128,65 @@ class IgneaException(Exception):
             description: Description of the exception.
         """
 
-        if where is not None:
-            super().__init__(f"{where}: {type_}: {description}")
-        else:
-            super().__init__(f"{type_}: {description}")
+        super().__init__()
+        self._where = where
+        self._type = type_
+        self._description = description
+        self._message: str | None = None
+
+    @property
+    def args(self) -> tuple[Any, ...]:
+        """Returns the message of the exception as its only argument."""
+
+        return (str(self),)
+
+    @args.setter
+    def args(self, args: tuple[Any, ...]) -> None:
+        """
+        Replaces the message of the exception.
+
+        Args:
+            args: Arguments whose first one is the new message.
+        """
+
+        self._message = str(args[0]) if len(args) > 0 else ""
+
+    def __str__(self) -> str:
+        """Returns the message of the exception."""
+
+        if self._message is not None:
+            return self._message
+
+        if self._where is not None:
+            return f"{self._where}: {self._type}{self._SUFFIX}: {self._description}"
+
+        return f"{self._type}{self._SUFFIX}: {self._description}"
+
+    def __repr__(self) -> str:
+        """Returns the representation of the exception with its message."""
+
+        return f"{type(self).__name__}({str(self)!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """
+        Returns how to rebuild the exception, as for pickle and copy.
+
+        The exception is rebuilt from its attributes without calling
+        `__init__`, since subclasses take different arguments.
+        """
+
+        return type(self).__new__, (type(self),), self.__dict__
 
 
 class IgneaExceptionHandler:
-    """Context manager to handle `IgneaException` objects."""
+    """
+    Context manager to handle `IgneaException` objects.
+
+    Since it is stateless, the instance returned by
+    `ignea_exception_handler` can be reused instead.
+    """
+
+    __slots__ = ()
 
     def __enter__(self) -> "IgneaExceptionHandler":
         """Returns itself."""
@@ -146,62 +218,31 @@ class IgneaExceptionHandler:
         return False
 
 
-class IgneaError(IgneaException):
-    """Generic error processing an input file."""
+_HANDLER = IgneaExceptionHandler()
 
-    def __init__(
-        self, where: IgneaPosition | str | None, type_: str, description: str
-    ) -> None:
-        """
-        Initializes the error with the required information.
 
-        Args:
-            where:
-                Where the error happened, or None if it is not
-                location-specific.
-            type_: Type of the error.
-            description: Description of the error.
-        """
+def ignea_exception_handler() -> IgneaExceptionHandler:
+    """Returns the shared `IgneaExceptionHandler` object."""
 
-        super().__init__(where, f"{type_} Error", description)
+    return _HANDLER
 
 
-class IgneaConditionsError(IgneaError):
-    """Generic error processing runtime conditions."""
+class IgneaError(IgneaException):
+    """Generic error processing an input file."""
 
-    def __init__(self, where: str | None, type_: str, description: str) -> None:
-        """
-        Initializes the error with the required information.
+    _SUFFIX = " Error"
 
-        Args:
-            where:
-                Where the error happened, or None if it is not
-                location-specific.
-            type_: Type of the error.
-            description: Description of the error.
-        """
 
-        super().__init__(where, f"{type_} Conditions", description)
+class IgneaConditionsError(IgneaError):
+    """Generic error processing runtime conditions."""
+
+    _SUFFIX = " Conditions Error"
 
 
 class IgneaWarning(IgneaException, Warning):
     """Generic warning processing an input file."""
 
-    def __init__(
-        self, where: IgneaPosition | str | None, type_: str, description: str
-    ) -> None:
-        """
-        Initializes the warning with the required information.
-
-        Args:
-            where:
-                Where the warning happened, or None if it is not
-                location-specific.
-            type_: Type of the warning.
-            description: Description of the warning.
-        """
-
-        super().__init__(where, f"{type_} Warning", description)
+    _SUFFIX = " Warning"
 
 
 def ignea_init_warnings() -> None:
@@ -243,16 +284,4 @@ def ignea_init_warnings() -> None:
 class IgneaConditionsWarning(IgneaWarning):
     """Generic warning processing runtime conditions."""
 
-    def __init__(self, where: str | None, type_: str, description: str) -> None:
-        """
-        Initializes the warning with the required information.
-
-        Args:
-            where:
-                Where the warning happened, or None if it is not
-                location-specific.
-            type_: Type of the warning.
-            description: Description of the warning.
-        """
-
-        super().__init__(where, f"{type_} Conditions", description)
+    _SUFFIX = " Conditions Warning"
@@ -18,8 +18,11 @@
 
 """Lexical analysis library for the Ignea front-end."""
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import ClassVar
+from functools import cache
+import re
+from typing import ClassVar, Literal
 
 from .common import (
     IgneaConditions,
@@ -30,6 +33,8 @@ from .common import (
 )
 
 IgneaLexingState = int
+_IgneaCompositeState = tuple[tuple[type["IgneaTerminalTag"], IgneaLexingState], ...]
+_IgneaDFATransition = tuple[int, int]
 
 
 class IgneaTerminalTag(metaclass=IgneaMeta):
@@ -46,9 +51,31 @@ class IgneaTerminalTag(metaclass=IgneaMeta):
         STATES_START:
             Bit mask indicating which NFA states are starting states.
             The default value indicates the first state.
+        PREFILTER:
+            Regular expression in `re` syntax used to skip input
+            directly when this terminal tag is ignored, or None if the
+            NFA must always be used. The default value is None.
+
+            This is an opt-in hook, never set by generated lexers, for
+            subclasses that skip long runs of whitespace and comments
+            with the `re` engine. The lexer trusts it without checking,
+            so it must match exactly the language of this terminal
+            tag: wherever it matches, the NFA of this terminal tag
+            must accept the same input, and that input must be the
+            longest match of all terminal tags, leaving no terminal tag
+            after processing positive and negative terminal tags. A
+            regular expression matching more or less than that
+            silently changes the terminal symbols produced.
+        _TERMINAL_TAG:
+            Always True, telling terminal tags apart from nonterminal
+            types without the cost of `issubclass` on the metaclass.
+            Its literal type makes mypy narrow a symbol that is a
+            terminal tag or a nonterminal type on checking it.
     """
 
     STATES_START: IgneaLexingState = 1
+    PREFILTER: ClassVar[str | None] = None
+    _TERMINAL_TAG: ClassVar[Literal[True]] = True
 
     @staticmethod
     def start(conditions: IgneaConditions) -> bool:
@@ -183,7 +210,7 @@ class IgneaTerminalTag(metaclass=IgneaMeta):
         raise NotImplementedError()
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class IgneaTerminal:
     """
     Terminal symbol (token) generated by lexical analysis.
@@ -194,6 +221,9 @@ class IgneaTerminal:
     This object integrates a linked-list structure to memoize lexical
     analysis and avoid processing the input multiple times.
 
+    This class is slotted. Dataclass subclasses should also be declared
+    with `slots=True`, otherwise their instances get a `__dict__` back.
+
     Attributes:
         tags: Terminal tags attributed to `value`.
         value: Accepted input substring.
@@ -208,7 +238,8 @@ class IgneaTerminal:
     value: str
     start_position: IgneaPosition
     end_position: IgneaPosition
-    next: "IgneaTerminal | None" = field(default=None, init=False)
+    # A factory, so __init__ of unslotted subclasses also initializes it
+    next: "IgneaTerminal | None" = field(default_factory=lambda: None, init=False)
 
     def __repr__(self) -> str:
         """Returns the representation of the terminal symbol as a tuple."""
@@ -216,7 +247,7 @@ class IgneaTerminal:
         return repr((self.tags, self.value, self.start_position, self.end_position))
 
 
-@dataclass
+@dataclass(slots=True)
 class _IgneaLexerCache:
     """
     Cache of runtime data required in lexical analysis.
@@ -228,9 +259,15 @@ class _IgneaLexerCache:
         states_start:
             Starting NFA states for all terminal tags included in
             lexical analysis.
+        composite_start:
+            Identifier of the composite state built from the items of
+            `states_start`, used as the starting state of the DFA.
         terminal_tags_ignore:
             Result of `IgneaTerminalTag.ignore` for all terminal
             tags included in lexical analysis.
+        prefilters:
+            Compiled `IgneaTerminalTag.PREFILTER` of all ignored
+            terminal tags included in lexical analysis.
         terminal_tags_offside:
             Result of `IgneaTerminalTag.indent` and
             `IgneaTerminalTag.dedent`, respectively, for all terminal
@@ -243,20 +280,45 @@ class _IgneaLexerCache:
         terminal_tags_negatives:
             Result of `IgneaTerminalTag.negatives` for all
             terminal tags included in lexical analysis.
+        closure_positives:
+            Terminal tags transitively added by each terminal tag
+            included in lexical analysis.
+        closure_negatives:
+            Terminal tags transitively removed by each terminal tag
+            included in lexical analysis.
+        accept_ids:
+            Identifier of each set of accepting terminal tags found so
+            far. The empty set has identifier 0.
         accepted_terminal_tags:
             Memoization of `IgneaLexer._process_positives_negatives`
-            after removal of ignored terminal tags.
+            after removal of ignored terminal tags, indexed by the
+            identifier of the set of accepting terminal tags.
         nfas:
             Memoization of `IgneaTerminalTag.nfa` for all
             terminal tags included in lexical analysis.
+        composite_ids:
+            Identifier of each composite state found so far, where a
+            composite state holds the NFA states of all terminal tags
+            still being processed. The empty composite state, where no
+            NFA can continue, has identifier 0.
+        composite_states: Composite states indexed by their identifier.
+        dfa:
+            Lazily built DFA simulating all NFAs at once. It is indexed
+            by the identifier of the current composite state, and then
+            by input character, mapping to the identifiers of the next
+            composite state and of the set of accepting terminal tags.
     """
 
     states_start: dict[type[IgneaTerminalTag], IgneaLexingState] = field(
         default_factory=dict, init=False, repr=False
     )
+    composite_start: int = field(default=0, init=False, repr=False)
     terminal_tags_ignore: set[type[IgneaTerminalTag]] = field(
         default_factory=set, init=False, repr=False
     )
+    prefilters: list[re.Pattern[str]] = field(
+        default_factory=list, init=False, repr=False
+    )
     terminal_tags_offside: (
         tuple[type[IgneaTerminalTag], type[IgneaTerminalTag]] | None
     ) = field(default=None, init=False, repr=False)
@@ -266,16 +328,97 @@ class _IgneaLexerCache:
     terminal_tags_negatives: dict[
         type[IgneaTerminalTag], set[type[IgneaTerminalTag]]
     ] = field(default_factory=dict, init=False, repr=False)
-    accepted_terminal_tags: dict[
-        frozenset[type[IgneaTerminalTag]], set[type[IgneaTerminalTag]]
+    closure_positives: dict[
+        type[IgneaTerminalTag], frozenset[type[IgneaTerminalTag]]
     ] = field(default_factory=dict, init=False, repr=False)
+    closure_negatives: dict[
+        type[IgneaTerminalTag], frozenset[type[IgneaTerminalTag]]
+    ] = field(default_factory=dict, init=False, repr=False)
+    accept_ids: dict[frozenset[type[IgneaTerminalTag]], int] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    accepted_terminal_tags: list[set[type[IgneaTerminalTag]]] = field(
+        default_factory=list, init=False, repr=False
+    )
     nfas: dict[
-        tuple[type[IgneaTerminalTag], IgneaLexingState, str],
-        tuple[bool, IgneaLexingState],
+        type[IgneaTerminalTag],
+        Callable[[IgneaLexingState, str], tuple[bool, IgneaLexingState]],
     ] = field(default_factory=dict, init=False, repr=False)
+    composite_ids: dict[_IgneaCompositeState, int] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    composite_states: list[_IgneaCompositeState] = field(
+        default_factory=list, init=False, repr=False
+    )
+    dfa: list[dict[str, _IgneaDFATransition]] = field(
+        default_factory=list, init=False, repr=False
+    )
 
+    def __post_init__(self) -> None:
+        """Initializes the identifiers of the empty sets and composite states."""
 
-@dataclass
+        self.accept_ids[frozenset()] = 0
+        self.accepted_terminal_tags.append(set())
+        self.get_composite_id(())
+
+    def get_composite_id(self, composite_state: _IgneaCompositeState) -> int:
+        """
+        Returns the identifier of a composite state, assigning a new one if needed.
+
+        Args:
+            composite_state: Composite state to be identified.
+        """
+
+        composite_id = self.composite_ids.get(composite_state)
+
+        if composite_id is None:
+            composite_id = len(self.composite_states)
+            self.composite_ids[composite_state] = composite_id
+            self.composite_states.append(composite_state)
+            self.dfa.append({})
+
+        return composite_id
+
+
+def _ignea_offside_nfa(
+    current_states: IgneaLexingState, char: str
+) -> tuple[IgneaLexingState, bool]:
+    """
+    Processes a single step of the off-side rule NFA.
+
+    This is only used to build `_IgneaOffside._TRANSITIONS`.
+
+    Args:
+        current_states: Bit mask of current states to be processed.
+        char: Representative of the character class to be processed.
+
+    Returns:
+        (`next_states`, `state_accept`), where `next_states` indicates
+        the bit mask of states to be processed in the next step, and
+        `state_accept` indicates whether `char` is the first
+        non-whitespace character of the line.
+    """
+
+    state_accept = False
+    next_states = 0
+
+    if 1 << 0 & current_states and char == "\n":
+        next_states |= 1 << 0 | 1 << 1 | 1 << 2
+
+    if 1 << 1 & current_states and char in "\t ":
+        next_states |= 1 << 0 | 1 << 1 | 1 << 2
+
+    if 1 << 2 & current_states and char not in "\t\n ":
+        state_accept = True
+        next_states |= 1 << 0 | 1 << 3
+
+    if 1 << 3 & current_states and char != "\n":
+        next_states |= 1 << 0 | 1 << 3
+
+    return next_states, state_accept
+
+
+@dataclass(slots=True)
 class _IgneaOffside:
     """
     Driver of the off-side rule.
@@ -285,6 +428,12 @@ class _IgneaOffside:
     Attributes:
         STATES_START:
             Bit mask indicating which NFA states are starting states.
+        _CHAR_CLASSES:
+            Character class of each whitespace character. Any other
+            character has class 2.
+        _TRANSITIONS:
+            Precomputed NFA steps, indexed by bit mask of current
+            states and character class.
         terminal_tags:
             Tags used to denote indentation and dedentation,
             respectively.
@@ -293,6 +442,11 @@ class _IgneaOffside:
     """
 
     STATES_START: ClassVar[IgneaLexingState] = 1 << 0 | 1 << 1 | 1 << 2
+    _CHAR_CLASSES: ClassVar[dict[str, int]] = {"\n": 0, "\t": 1, " ": 1}
+    _TRANSITIONS: ClassVar[list[tuple[tuple[IgneaLexingState, bool], ...]]] = [
+        tuple(_ignea_offside_nfa(states, char) for char in "\n\t.")
+        for states in range(1 << 4)
+    ]
 
     terminal_tags: tuple[type[IgneaTerminalTag], type[IgneaTerminalTag]] | None
     _stack: list[int] = field(default_factory=list, init=False, repr=False)
@@ -319,23 +473,9 @@ class _IgneaOffside:
             the line.
         """
 
-        state_accept = False
-        next_states = 0
-
-        if 1 << 0 & self._state and char == "\n":
-            next_states |= 1 << 0 | 1 << 1 | 1 << 2
-
-        if 1 << 1 & self._state and char in "\t ":
-            next_states |= 1 << 0 | 1 << 1 | 1 << 2
-
-        if 1 << 2 & self._state and char not in "\t\n ":
-            state_accept = True
-            next_states |= 1 << 0 | 1 << 3
-
-        if 1 << 3 & self._state and char != "\n":
-            next_states |= 1 << 0 | 1 << 3
-
-        self._state = next_states
+        self._state, state_accept = self._TRANSITIONS[self._state][
+            self._CHAR_CLASSES.get(char, 2)
+        ]
         return state_accept
 
     def prepend_offside_terminals(
@@ -361,26 +501,29 @@ class _IgneaOffside:
         """
 
         if self.terminal_tags is not None:
+            stack = self._stack
+            column = start_position.column
+
             if current_terminal is None:
-                for _ in range(len(self._stack) - 1):
+                for _ in range(len(stack) - 1):
                     current_terminal = self._get_offside_terminal(
                         start_position, current_terminal
                     )
-                    self._stack.pop()
-            elif start_position.column < self._stack[-1]:
-                while start_position.column < self._stack[-1]:
+                    stack.pop()
+            elif column < stack[-1]:
+                while column < stack[-1]:
                     current_terminal = self._get_offside_terminal(
                         start_position, current_terminal
                     )
-                    self._stack.pop()
+                    stack.pop()
 
-                if start_position.column > self._stack[-1]:
+                if column > stack[-1]:
                     raise IgneaIndentationError(start_position)
-            elif start_position.column > self._stack[-1]:
+            elif column > stack[-1]:
                 current_terminal = self._get_offside_terminal(
                     start_position, current_terminal, True
                 )
-                self._stack.append(start_position.column)
+                stack.append(column)
 
         return current_terminal
 
@@ -418,7 +561,7 @@ class _IgneaOffside:
         return offside_terminal
 
 
-@dataclass
+@dataclass(slots=True)
 class _IgneaLexerStore:
     """
     Store of runtime transient data structures used in lexical analysis.
@@ -427,49 +570,40 @@ class _IgneaLexerStore:
     structures.
 
     Attributes:
-        current_position:
-            Current input position being processed in lexical
-            analysis.
-        current_states:
-            Current NFA states for all terminal tags being processed
-            in lexical analysis.
-        current_positive_terminal_tags:
-            Current positive terminal tags being processed in
-            `IgneaLexer._process_positives_negatives`.
-        current_negative_terminal_tags:
-            Current negative terminal tags being processed in
-            `IgneaLexer._process_positives_negatives`.
-        next_states:
-            Next NFA states for all terminal tags to be processed in
-            lexical analysis. It must always be empty after use.
-        next_terminal_tags:
-            Next terminal tags to be processed. It must always be
-            empty after use.
         offside: State and logic required to apply the off-side rule.
     """
 
-    current_position: IgneaPosition = field(init=False, repr=False)
-    current_states: dict[type[IgneaTerminalTag], IgneaLexingState] = field(
-        default_factory=dict, init=False, repr=False
-    )
-    current_positive_terminal_tags: set[type[IgneaTerminalTag]] = field(
-        default_factory=set, init=False, repr=False
-    )
-    current_negative_terminal_tags: set[type[IgneaTerminalTag]] = field(
-        default_factory=set, init=False, repr=False
-    )
-    next_states: dict[type[IgneaTerminalTag], IgneaLexingState] = field(
-        default_factory=dict, init=False, repr=False
-    )
-    next_terminal_tags: set[type[IgneaTerminalTag]] = field(
-        default_factory=set, init=False, repr=False
-    )
     offside: _IgneaOffside = field(init=False, repr=False)
 
-    def __post_init__(self) -> None:
-        """Initializes `current_position`."""
 
-        self.current_position = IgneaPosition("", 0, 1, 1)
+def _ignea_transitive_closure(
+    relation: dict[type[IgneaTerminalTag], set[type[IgneaTerminalTag]]],
+) -> dict[type[IgneaTerminalTag], frozenset[type[IgneaTerminalTag]]]:
+    """
+    Computes the transitive closure of a relation between terminal tags.
+
+    Args:
+        relation: Terminal tags directly related to each terminal tag.
+
+    Returns: Terminal tags transitively related to each terminal tag.
+    """
+
+    closure = {}
+
+    for terminal_tag, related_terminal_tags in relation.items():
+        reached: set[type[IgneaTerminalTag]] = set()
+        pending = list(related_terminal_tags)
+
+        while len(pending) > 0:
+            related_terminal_tag = pending.pop()
+
+            if related_terminal_tag not in reached:
+                reached.add(related_terminal_tag)
+                pending.extend(relation[related_terminal_tag])
+
+        closure[terminal_tag] = frozenset(reached)
+
+    return closure
 
 
 @dataclass
@@ -480,6 +614,10 @@ class IgneaLexer:
     This allows performing lexical analysis on demand using
     `next_terminal`.
 
+    This class is not slotted, since it is meant to be subclassed, and
+    dataclass subclasses of a slotted class would leave inherited
+    fields with defaults and excluded from `__init__` uninitialized.
+
     Attributes:
         TERMINAL_TAGS:
             Terminal tags to be included in lexical analysis.
@@ -562,10 +700,16 @@ class IgneaLexer:
                     continue
 
                 self._cache.states_start[terminal_tag] = terminal_tag.STATES_START
+                self._cache.nfas[terminal_tag] = cache(terminal_tag.nfa)
 
                 if terminal_tag.ignore(self.conditions):
                     self._cache.terminal_tags_ignore.add(terminal_tag)
 
+                    if terminal_tag.PREFILTER is not None:
+                        self._cache.prefilters.append(
+                            re.compile(terminal_tag.PREFILTER)
+                        )
+
                 self._cache.terminal_tags_positives[terminal_tag] = {
                     tag
                     for tag in terminal_tag.positives(self.conditions)
@@ -595,6 +739,15 @@ class IgneaLexer:
                 terminal_tags_offside[1],
             )
 
+        self._cache.composite_start = self._cache.get_composite_id(
+            tuple(self._cache.states_start.items())
+        )
+        self._cache.closure_positives = _ignea_transitive_closure(
+            self._cache.terminal_tags_positives
+        )
+        self._cache.closure_negatives = _ignea_transitive_closure(
+            self._cache.terminal_tags_negatives
+        )
         self._store.offside = _IgneaOffside(self._cache.terminal_tags_offside)
 
     def next_terminal(
@@ -654,137 +807,221 @@ class IgneaLexer:
         if start_position.index_ == len(self.input):
             return self._store.offside.prepend_offside_terminals(start_position)
 
+        # Local bindings avoid repeated attribute lookups in the
+        # per-character loop, and positions are only materialized as
+        # objects at terminal symbol boundaries
+        input_ = self.input
+        input_length = len(input_)
+        dfa = self._cache.dfa
+        offside = self._store.offside
+        is_offside_enabled = offside.terminal_tags is not None
+        accepted_offside_state = offside._state
         start_position = start_position.copy()
-        self._store.current_position.update(start_position)
-        self._store.current_states.clear()
-        self._store.current_states.update(self._cache.states_start)
+        current_index = accepted_index = start_position.index_
+        current_line = accepted_line = start_position.line
+        current_column = accepted_column = start_position.column
+        current_states = self._cache.composite_start
         last_terminal_tags: list[type[IgneaTerminalTag]] = []
         is_offside = False
-        accepted_position = start_position.copy()
-        accepted_terminal_tags: set[type[IgneaTerminalTag]] = set()
+        accept_id = 0
 
         while True:
-            while len(
-                self._store.current_states
-            ) > 0 and self._store.current_position.index_ < len(self.input):
-                char = self.input[self._store.current_position.index_]
-                self._process_nfas(char)
-                self._store.current_position.index_ += 1
+            if len(self._cache.prefilters) > 0 and self._skip_prefiltered(
+                start_position
+            ):
+                current_index = accepted_index = start_position.index_
+                current_line = accepted_line = start_position.line
+                current_column = accepted_column = start_position.column
+                accepted_offside_state = offside._state
+
+            while current_states != 0 and current_index < input_length:
+                char = input_[current_index]
+                transition = dfa[current_states].get(char)
+
+                if transition is None:
+                    transition = self._process_nfas(current_states, char)
+
+                next_states, next_accept_id = transition
+
+                # Whether the first non-whitespace character of the line
+                # is at the start of a terminal
+                if (
+                    is_offside_enabled
+                    and offside.nfa(char)
+                    and current_index == start_position.index_
+                ):
+                    is_offside = True
+
+                current_index += 1
 
                 if char != "\n":
-                    self._store.current_position.column += 1
+                    current_column += 1
                 else:
-                    self._store.current_position.line += 1
-                    self._store.current_position.column = 1
+                    current_line += 1
+                    current_column = 1
 
-                if len(self._store.next_terminal_tags) > 0:
-                    accepted_terminal_tags, self._store.next_terminal_tags = (
-                        self._store.next_terminal_tags,
-                        accepted_terminal_tags,
-                    )
-                    # next_terminal_tags is always empty after use
-                    self._store.next_terminal_tags.clear()
-
-                    # The off-side NFA needs to run at this point
-                    # because otherwise it would run multiple times
-                    # over the same characters, due to the
-                    # backtracking of the longest match principle
-                    for index_ in range(
-                        accepted_position.index_, self._store.current_position.index_
-                    ):
-                        if self._store.offside.nfa(self.input[index_]):
-                            # Whether the first non-whitespace
-                            # character of the line is at the start of
-                            # a terminal
-                            is_offside |= index_ == start_position.index_
-
-                    accepted_position.update(self._store.current_position)
-
-                self._store.current_states, self._store.next_states = (
-                    self._store.next_states,
-                    self._store.current_states,
-                )
+                if next_accept_id != 0:
+                    accept_id = next_accept_id
+                    accepted_offside_state = offside._state
+                    accepted_index = current_index
+                    accepted_line = current_line
+                    accepted_column = current_column
 
                 # If no NFA can continue processing the input, save
                 # the terminal tags of those that got furthest in case
                 # an error needs to be raised
-                if len(self._store.current_states) == 0 and len(
-                    self._store.next_states
-                ) < len(self._cache.states_start):
-                    last_terminal_tags.clear()
-                    last_terminal_tags.extend(self._store.next_states)
+                if next_states == 0:
+                    composite_state = self._cache.composite_states[current_states]
 
-                # next_states is always empty after use
-                self._store.next_states.clear()
+                    if len(composite_state) < len(self._cache.states_start):
+                        last_terminal_tags.clear()
+                        last_terminal_tags.extend(
+                            terminal_tag for terminal_tag, _ in composite_state
+                        )
 
-            if len(accepted_terminal_tags) == 0:
-                raise IgneaNoTerminalTagError(start_position, last_terminal_tags)
+                current_states = next_states
 
-            initial_accepted_terminal_tags = frozenset(accepted_terminal_tags)
+            # The off-side NFA must not process the characters after the
+            # accepted position, since they are going to be processed
+            # again due to the backtracking of the longest match
+            # principle
+            offside._state = accepted_offside_state
 
-            if initial_accepted_terminal_tags not in self._cache.accepted_terminal_tags:
-                self._process_positives_negatives(accepted_terminal_tags)
-                accepted_terminal_tags -= self._cache.terminal_tags_ignore
-                self._cache.accepted_terminal_tags[initial_accepted_terminal_tags] = (
-                    accepted_terminal_tags.copy()
-                )
-            else:
-                accepted_terminal_tags.clear()
-                accepted_terminal_tags.update(
-                    self._cache.accepted_terminal_tags[initial_accepted_terminal_tags]
-                )
+            if accept_id == 0:
+                raise IgneaNoTerminalTagError(start_position, last_terminal_tags)
 
-            if len(accepted_terminal_tags) > 0:
+            terminal_tags = self._cache.accepted_terminal_tags[accept_id]
+
+            if len(terminal_tags) > 0:
                 next_terminal: IgneaTerminal | None = IgneaTerminal(
-                    accepted_terminal_tags,
-                    self.input[start_position.index_ : accepted_position.index_],
+                    terminal_tags.copy(),
+                    input_[start_position.index_ : accepted_index],
                     start_position,
-                    accepted_position,
+                    IgneaPosition(
+                        start_position.filename,
+                        accepted_index,
+                        accepted_line,
+                        accepted_column,
+                    ),
                 )
 
                 if is_offside:
-                    next_terminal = self._store.offside.prepend_offside_terminals(
+                    next_terminal = offside.prepend_offside_terminals(
                         start_position, next_terminal
                     )
 
                 return next_terminal
 
-            if self._store.current_position.index_ == len(self.input):
-                return self._store.offside.prepend_offside_terminals(start_position)
+            if accepted_index == input_length:
+                return offside.prepend_offside_terminals(start_position)
 
             # Skip ignored terminal symbol and restart
-            start_position.update(accepted_position)
-            self._store.current_position.update(accepted_position)
-            assert len(self._store.current_states) == 0
-            self._store.current_states.update(self._cache.states_start)
+            start_position.index_ = current_index = accepted_index
+            start_position.line = current_line = accepted_line
+            start_position.column = current_column = accepted_column
+            assert current_states == 0
+            current_states = self._cache.composite_start
+            accept_id = 0
             last_terminal_tags.clear()
             is_offside = False
 
-    def _process_nfas(self, char: str) -> None:
+    def _skip_prefiltered(self, position: IgneaPosition) -> bool:
+        """
+        Skips ignored terminal symbols matched by `_IgneaLexerCache.prefilters`.
+
+        The position is updated in-place, and the off-side NFA
+        processes the skipped input. Matches reaching the end of input
+        are not skipped, leaving the last ignored terminal symbol to
+        the NFAs, so off-side terminal symbols at the end of input are
+        placed at its start, as without prefilters.
+
+        Args:
+            position: Position to start skipping input.
+
+        Returns: Whether any input was skipped.
+        """
+
+        input_length = len(self.input)
+        start_index = end_index = position.index_
+        is_skipping = True
+
+        while is_skipping:
+            is_skipping = False
+
+            for prefilter in self._cache.prefilters:
+                match = prefilter.match(self.input, end_index)
+
+                if match is not None and end_index < match.end() < input_length:
+                    end_index = match.end()
+                    is_skipping = True
+
+        if end_index == start_index:
+            return False
+
+        if self._store.offside.terminal_tags is not None:
+            for char in self.input[start_index:end_index]:
+                self._store.offside.nfa(char)
+
+        newlines = self.input.count("\n", start_index, end_index)
+
+        if newlines == 0:
+            position.column += end_index - start_index
+        else:
+            position.line += newlines
+            position.column = end_index - self.input.rfind("\n", start_index, end_index)
+
+        position.index_ = end_index
+        return True
+
+    def _process_nfas(self, current_states: int, char: str) -> _IgneaDFATransition:
         """
         Processes a single step of all NFAs, memoizing the results.
 
+        The combined result is memoized as a transition of the DFA. If
+        the set of accepting terminal tags was not found before, it is
+        assigned a new identifier, and its positive and negative
+        terminal tags are processed.
+
         Args:
+            current_states:
+                Identifier of the composite state with the current NFA
+                states for all terminal tags being processed.
             char: Current input character to be processed.
+
+        Returns:
+            (`next_states`, `accept_id`), where `next_states`
+            indicates the identifier of the composite state with the
+            NFA states to be processed in the next step, and
+            `accept_id` indicates the identifier of the set of
+            terminal tags whose NFAs accept the input.
         """
 
-        for terminal_tag, current_states in self._store.current_states.items():
-            if (terminal_tag, current_states, char) not in self._cache.nfas:
-                state_accept, states = terminal_tag.nfa(current_states, char)
-                self._cache.nfas[terminal_tag, current_states, char] = (
-                    state_accept,
-                    states,
-                )
-            else:
-                state_accept, states = self._cache.nfas[
-                    terminal_tag, current_states, char
-                ]
+        next_states = []
+        next_terminal_tags = []
+
+        for terminal_tag, tag_states in self._cache.composite_states[current_states]:
+            state_accept, states = self._cache.nfas[terminal_tag](tag_states, char)
 
             if state_accept:
-                self._store.next_terminal_tags.add(terminal_tag)
+                next_terminal_tags.append(terminal_tag)
 
             if states != 0:
-                self._store.next_states[terminal_tag] = states
+                next_states.append((terminal_tag, states))
+
+        accepting_terminal_tags = frozenset(next_terminal_tags)
+        accept_id = self._cache.accept_ids.get(accepting_terminal_tags)
+
+        if accept_id is None:
+            accept_id = len(self._cache.accepted_terminal_tags)
+            self._cache.accept_ids[accepting_terminal_tags] = accept_id
+            terminal_tags = set(accepting_terminal_tags)
+            self._process_positives_negatives(terminal_tags)
+            terminal_tags -= self._cache.terminal_tags_ignore
+            self._cache.accepted_terminal_tags.append(terminal_tags)
+
+        transition = (self._cache.get_composite_id(tuple(next_states)), accept_id)
+        self._cache.dfa[current_states][char] = transition
+        return transition
 
     def _process_positives_negatives(
         self, positive_terminal_tags: set[type[IgneaTerminalTag]]
@@ -802,62 +1039,13 @@ class IgneaLexer:
             positive_terminal_tags: Initial positive terminal tags.
         """
 
-        self._store.current_positive_terminal_tags.clear()
-        self._store.current_positive_terminal_tags.update(positive_terminal_tags)
+        for terminal_tag in tuple(positive_terminal_tags):
+            positive_terminal_tags |= self._cache.closure_positives[terminal_tag]
 
-        while True:
-            for terminal_tag in self._store.current_positive_terminal_tags:
-                self._store.next_terminal_tags |= self._cache.terminal_tags_positives[
-                    terminal_tag
-                ]
-
-            self._store.next_terminal_tags -= positive_terminal_tags
-
-            if len(self._store.next_terminal_tags) == 0:
-                # next_terminal_tags is always empty after use
-                break
-
-            positive_terminal_tags |= self._store.next_terminal_tags
-            (
-                self._store.current_positive_terminal_tags,
-                self._store.next_terminal_tags,
-            ) = (
-                self._store.next_terminal_tags,
-                self._store.current_positive_terminal_tags,
-            )
-            self._store.next_terminal_tags.clear()
-
-        # Reuse set for efficiency
-        negative_terminal_tags = self._store.current_positive_terminal_tags
-        negative_terminal_tags.clear()
+        negative_terminal_tags: set[type[IgneaTerminalTag]] = set()
 
         for terminal_tag in positive_terminal_tags:
-            negative_terminal_tags |= self._cache.terminal_tags_negatives[terminal_tag]
-
-        self._store.current_negative_terminal_tags.clear()
-        self._store.current_negative_terminal_tags.update(negative_terminal_tags)
-
-        while True:
-            for terminal_tag in self._store.current_negative_terminal_tags:
-                self._store.next_terminal_tags |= self._cache.terminal_tags_negatives[
-                    terminal_tag
-                ]
-
-            self._store.next_terminal_tags -= negative_terminal_tags
-
-            if len(self._store.next_terminal_tags) == 0:
-                # next_terminal_tags is always empty after use
-                break
-
-            negative_terminal_tags |= self._store.next_terminal_tags
-            (
-                self._store.current_negative_terminal_tags,
-                self._store.next_terminal_tags,
-            ) = (
-                self._store.next_terminal_tags,
-                self._store.current_negative_terminal_tags,
-            )
-            self._store.next_terminal_tags.clear()
+            negative_terminal_tags |= self._cache.closure_negatives[terminal_tag]
 
         positive_terminal_tags -= negative_terminal_tags
 
@@ -17,26 +17,27 @@
 
 from collections import deque
 from dataclasses import dataclass, field
-from typing import ClassVar, TypeGuard
 
 from ..common import IgneaPosition, IgneaError, IgneaWarning
 from ..lexical import IgneaTerminalTag, IgneaTerminal
 from ..syntactic import IgneaNonterminalType, IgneaParsingState, IgneaEPN, IgneaBSR
 
 
+# Not slotted, since dataclass subclasses of a slotted class would not
+# initialize the inherited defaults of fields excluded from __init__
 @dataclass
 class IgneaBSRVisitor:
-    _instance: ClassVar["IgneaBSRVisitor | None"] = None
     bsr: IgneaBSR
+    # Children of EPNs got by descend, taken by the visit loop so the BSR is
+    # queried once per EPN, and cleared on every visit since the BSR may
+    # change between visits
+    _children: dict[IgneaEPN, tuple[list[IgneaEPN], list[IgneaEPN]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
 
     @classmethod
     def get(cls, bsr: IgneaBSR) -> "IgneaBSRVisitor":
-        if cls._instance is None:
-            cls._instance = cls(bsr)
-        else:
-            cls._instance.bsr = bsr
-
-        return cls._instance
+        return cls(bsr)
 
     def visit(self) -> None:
         if (
@@ -46,63 +47,94 @@ class IgneaBSRVisitor:
         ):
             return
 
-        descend_queue = deque([list(self.bsr.epns[self.bsr.start])])
-        ascend_stack = []
-        descend_queue_levels = [1, 0]
-        ascend_stack_levels = [1]
+        # None marks the end of each level in both the queue and the stack
+        descend_queue: deque[list[IgneaEPN] | None] = deque(
+            [list(self.bsr.epns[self.bsr.start]), None]
+        )
+        ascend_stack: list[list[IgneaEPN] | None] = []
+        level_changed = False
+        ascend_level_changed = False
+        # Without an overridden bottom nothing is ever ascended
+        descend_only = type(self).bottom is IgneaBSRVisitor.bottom
+        children = self._children
+        children.clear()
         self.top_before()
 
-        while len(descend_queue) > 0:
-            epns = descend_queue.popleft()
-            level_changed = False
+        while True:
+            epns_opt = descend_queue.popleft()
 
-            if descend_queue_levels[0] == 0:
+            if epns_opt is None:
+                if len(descend_queue) == 0:
+                    break
+
+                descend_queue.append(None)
                 level_changed = True
-                descend_queue_levels[0] = descend_queue_levels[1]
-                descend_queue_levels[1] = 0
-                ascend_stack_levels.append(descend_queue_levels[0])
+                ascend_level_changed = True
+                continue
 
-            descend_queue_levels[0] -= 1
-            epns = self.descend(epns, level_changed)
+            epns = self.descend(epns_opt, level_changed)
+            level_changed = False
 
             if len(epns) == 0:
-                ascend_stack_levels[-1] -= 1
-
-                if ascend_stack_levels[-1] == 0:
-                    ascend_stack_levels.pop()
-
                 continue
 
-            ascend_stack.append(epns)
+            if not descend_only:
+                if ascend_level_changed:
+                    ascend_stack.append(None)
+                    ascend_level_changed = False
+
+                ascend_stack.append(epns)
 
             for epn in epns:
-                left_children = list(self.bsr.left_children(epn))
-                right_children = list(self.bsr.right_children(epn))
+                epn_children = children.pop(epn, None)
+
+                if epn_children is None:
+                    epn_children = (
+                        list(self.bsr.left_children(epn)),
+                        list(self.bsr.right_children(epn)),
+                    )
+
+                left_children, right_children = epn_children
 
                 if len(left_children) > 0:
                     descend_queue.append(left_children)
-                    descend_queue_levels[1] += 1
 
                 if len(right_children) > 0:
                     descend_queue.append(right_children)
-                    descend_queue_levels[1] += 1
 
-        if not self.bottom():
+        if descend_only or not self.bottom():
+            children.clear()
             return
 
+        level_changed = False
+
         while len(ascend_stack) > 0:
-            epns = ascend_stack.pop()
-            level_changed = False
+            epns_opt = ascend_stack.pop()
 
-            if ascend_stack_levels[-1] == 0:
+            if epns_opt is None:
                 level_changed = True
-                ascend_stack_levels.pop()
+                continue
 
-            ascend_stack_levels[-1] -= 1
-            self.ascend(epns, level_changed)
+            self.ascend(epns_opt, level_changed)
+            level_changed = False
 
+        children.clear()
         self.top_after()
 
+    # Children of an EPN for descend, kept for the visit loop to reuse
+    def _get_children(self, epn: IgneaEPN) -> tuple[list[IgneaEPN], list[IgneaEPN]]:
+        epn_children = self._children.get(epn)
+
+        if epn_children is None:
+            epn_children = (
+                list(self.bsr.left_children(epn)),
+                list(self.bsr.right_children(epn)),
+            )
+
+            self._children[epn] = epn_children
+
+        return epn_children
+
     def top_before(self) -> None:
         pass
 
@@ -160,10 +192,6 @@ class IgneaBSRFold[T](IgneaBSRVisitor):
         default_factory=deque, init=False, repr=False
     )
 
-    @staticmethod
-    def _fold_filter(item: T | None) -> TypeGuard[T]:
-        return item is not None
-
     def top_before(self) -> None:
         self._fold_queue.clear()
 
@@ -179,12 +207,12 @@ class IgneaBSRFold[T](IgneaBSRVisitor):
 
             if left_children or right_children:
                 fold_right = (
-                    list(filter(self._fold_filter, self._fold_queue.pop()))
+                    [f for f in self._fold_queue.pop() if f is not None]
                     if right_children
                     else []
                 )
                 fold_left = (
-                    list(filter(self._fold_filter, self._fold_queue.pop()))
+                    [f for f in self._fold_queue.pop() if f is not None]
                     if left_children
                     else []
                 )
@@ -220,69 +248,89 @@ class IgneaBSRToTreeConverter(IgneaBSRVisitor):
     _parents: deque["IgneaNonterminalTreeNode"] = field(
         default_factory=deque, init=False, repr=False
     )
+    # Created nodes, whose children are built last to first
+    _nodes: list["IgneaNonterminalTreeNode"] = field(
+        default_factory=list, init=False, repr=False
+    )
 
     def top_before(self) -> None:
         self.tree = None
         self._parents.clear()
+        self._nodes.clear()
 
     def descend(self, epns: list[IgneaEPN], _) -> list[IgneaEPN]:
         parent = self._parents.popleft() if len(self._parents) > 0 else None
-        assert epns[0].state.end_terminal is not None
+        epn = epns[0]
+        state = epn.state
+        end_terminal = state.end_terminal
+        assert end_terminal is not None
 
-        if epns[0].type_ is not None:
+        if epn.type_ is not None:
             node = IgneaNonterminalTreeNode(
-                epns[0].type_, epns[0].state.start_position, epns[0].state.end_terminal
+                epn.type_, state.start_position, end_terminal
             )
 
             if parent is not None:
+                children = parent.children
+
                 if (
-                    len(parent.children) > 0
-                    and parent.children[0].start_position.index_
-                    < node.start_position.index_
+                    len(children) > 0
+                    and children[-1].start_position.index_ < node.start_position.index_
                 ):
-                    parent.children.insert(1, node)
+                    children.insert(len(children) - 1, node)
                 else:
-                    parent.children.insert(0, node)
+                    children.append(node)
             else:
                 self.tree = node
 
+            self._nodes.append(node)
             parent = node
 
         assert parent is not None
+        left_children, right_children = self._get_children(epn)
 
-        if len(self.bsr.left_children(epns[0])) > 0:
+        if len(left_children) > 0:
             self._parents.append(parent)
 
-        if len(self.bsr.right_children(epns[0])) > 0:
+        if len(right_children) > 0:
             self._parents.append(parent)
-        elif epns[0].state.split_position != epns[0].state.end_terminal.end_position:
-            assert issubclass(epns[0].state.string[-1], IgneaTerminalTag)
-            parent.children.insert(
-                0,
-                IgneaTerminalTreeNode(
-                    epns[0].state.string[-1],
-                    epns[0].state.split_position,
-                    epns[0].state.end_terminal,
-                ),
+        elif state.split_position != end_terminal.end_position:
+            terminal_tag = state.string[-1]
+            # Narrows the symbol to a terminal tag for mypy
+            assert terminal_tag._TERMINAL_TAG
+            parent.children.append(
+                IgneaTerminalTreeNode(terminal_tag, state.split_position, end_terminal),
             )
 
         return epns
 
     def bottom(self) -> bool:
-        if self.tree is not None:
-            IgneaTreePositionFixer.get(self.tree).visit()
+        # Nodes were created parents first, so iterating backwards fixes
+        # the positions of children before those of their parents, as
+        # IgneaTreePositionFixer would
+        for node in reversed(self._nodes):
+            node.children.reverse()
+
+            for child in node.children:
+                if isinstance(child, IgneaTerminalTreeNode):
+                    child.start_position = child.end_terminal.start_position
 
+            node.start_position = node.children[0].start_position
+
+        self._nodes.clear()
         return False
 
 
-@dataclass
+# Slotted, since there is one node per symbol, so dataclass subclasses
+# must be slotted too to keep the saving
+@dataclass(slots=True)
 class IgneaTreeNode:
     type_: type[IgneaTerminalTag | IgneaNonterminalType]
     start_position: IgneaPosition
     end_terminal: IgneaTerminal
 
 
-@dataclass
+@dataclass(slots=True)
 class IgneaTerminalTreeNode(IgneaTreeNode):
     type_: type[IgneaTerminalTag]
 
@@ -290,7 +338,7 @@ class IgneaTerminalTreeNode(IgneaTreeNode):
         return repr((self.type_, self.start_position, self.end_terminal))
 
 
-@dataclass
+@dataclass(slots=True)
 class IgneaNonterminalTreeNode(IgneaTreeNode):
     type_: type[IgneaNonterminalType]
     children: list[IgneaTreeNode] = field(default_factory=list, init=False)
@@ -309,68 +357,68 @@ class IgneaNonterminalTreeNode(IgneaTreeNode):
         return n
 
 
+# Not slotted, since dataclass subclasses of a slotted class would not
+# initialize the inherited defaults of fields excluded from __init__
 @dataclass
 class IgneaTreeVisitor:
-    _instance: ClassVar["IgneaTreeVisitor | None"] = None
     tree: IgneaNonterminalTreeNode
 
     @classmethod
     def get(cls, tree: IgneaNonterminalTreeNode) -> "IgneaTreeVisitor":
-        if cls._instance is None:
-            cls._instance = cls(tree)
-        else:
-            cls._instance.tree = tree
-
-        return cls._instance
+        return cls(tree)
 
     def visit(self) -> None:
-        descend_queue: deque[IgneaTreeNode] = deque([self.tree])
-        ascend_stack = []
-        descend_queue_levels = [1, 0]
-        ascend_stack_levels = [1]
+        # None marks the end of each level in both the queue and the stack
+        descend_queue: deque[IgneaTreeNode | None] = deque([self.tree, None])
+        ascend_stack: list[IgneaTreeNode | None] = []
+        level_changed = False
+        ascend_level_changed = False
+        # Without an overridden bottom nothing is ever ascended
+        descend_only = type(self).bottom is IgneaTreeVisitor.bottom
         self.top_before()
 
-        while len(descend_queue) > 0:
-            node = descend_queue.popleft()
-            level_changed = False
+        while True:
+            node_opt = descend_queue.popleft()
 
-            if descend_queue_levels[0] == 0:
+            if node_opt is None:
+                if len(descend_queue) == 0:
+                    break
+
+                descend_queue.append(None)
                 level_changed = True
-                descend_queue_levels[0] = descend_queue_levels[1]
-                descend_queue_levels[1] = 0
-                ascend_stack_levels.append(descend_queue_levels[0])
+                ascend_level_changed = True
+                continue
 
-            descend_queue_levels[0] -= 1
-            node_opt = self.descend(node, level_changed)
+            node_opt = self.descend(node_opt, level_changed)
+            level_changed = False
 
             if node_opt is None:
-                ascend_stack_levels[-1] -= 1
-
-                if ascend_stack_levels[-1] == 0:
-                    ascend_stack_levels.pop()
-
                 continue
 
-            node = node_opt
-            ascend_stack.append(node)
+            if not descend_only:
+                if ascend_level_changed:
+                    ascend_stack.append(None)
+                    ascend_level_changed = False
+
+                ascend_stack.append(node_opt)
 
-            if isinstance(node, IgneaNonterminalTreeNode):
-                descend_queue.extend(node.children)
-                descend_queue_levels[1] += len(node.children)
+            if isinstance(node_opt, IgneaNonterminalTreeNode):
+                descend_queue.extend(node_opt.children)
 
-        if not self.bottom():
+        if descend_only or not self.bottom():
             return
 
+        level_changed = False
+
         while len(ascend_stack) > 0:
-            node = ascend_stack.pop()
-            level_changed = False
+            node_opt = ascend_stack.pop()
 
-            if ascend_stack_levels[-1] == 0:
+            if node_opt is None:
                 level_changed = True
-                ascend_stack_levels.pop()
+                continue
 
-            ascend_stack_levels[-1] -= 1
-            self.ascend(node, level_changed)
+            self.ascend(node_opt, level_changed)
+            level_changed = False
 
         self.top_after()
 
@@ -411,11 +459,7 @@ class IgneaTreeTransformer(IgneaTreeVisitor):
 
 @dataclass
 class IgneaTreeFold[T](IgneaTreeVisitor):
-    _fold_queue: list[T | None] = field(default_factory=list, init=False, repr=False)
-
-    @staticmethod
-    def _fold_filter(item: T | None) -> TypeGuard[T]:
-        return item is not None
+    _fold_queue: deque[T | None] = field(default_factory=deque, init=False, repr=False)
 
     def top_before(self) -> None:
         self._fold_queue.clear()
@@ -425,16 +469,23 @@ class IgneaTreeFold[T](IgneaTreeVisitor):
 
     def ascend(self, node: IgneaTreeNode, _) -> None:
         if isinstance(node, IgneaNonterminalTreeNode):
-            fold_children = list(
-                filter(self._fold_filter, self._fold_queue[-len(node.children) :])
-            )
-            self._fold_queue = self._fold_queue[: -len(node.children)]
+            # Children were ascended last to first, so their folds are
+            # popped in reverse order
+            fold_children = []
+
+            for _ in node.children:
+                fold = self._fold_queue.pop()
+
+                if fold is not None:
+                    fold_children.append(fold)
+
+            fold_children.reverse()
             fold = self.fold_internal(node, fold_children)
         else:
             assert isinstance(node, IgneaTerminalTreeNode)
             fold = self.fold_external(node)
 
-        self._fold_queue.insert(0, fold)
+        self._fold_queue.appendleft(fold)
 
     def fold(self) -> T | None:
         self.visit()
@@ -471,10 +522,8 @@ class IgneaTreePositionUnfixer(IgneaTreeVisitor):
         if isinstance(node, IgneaNonterminalTreeNode):
             node.children[0].start_position = node.start_position
 
-            for i in range(1, len(node.children)):
-                node.children[i].start_position = node.children[
-                    i - 1
-                ].end_terminal.end_position
+            for previous, child in zip(node.children, node.children[1:]):
+                child.start_position = previous.end_terminal.end_position
 
         return node
 
@@ -482,6 +531,12 @@ class IgneaTreePositionUnfixer(IgneaTreeVisitor):
 @dataclass
 class IgneaTreeToBSRConverter(IgneaTreeVisitor):
     bsr: IgneaBSR = field(init=False, repr=False)
+    # Interned strings and their prefixes, shared by nodes of the same
+    # production as IgneaParser does for parsing states
+    _strings: dict[
+        tuple[type[IgneaTerminalTag | IgneaNonterminalType], ...],
+        tuple[tuple[type[IgneaTerminalTag | IgneaNonterminalType], ...], ...],
+    ] = field(default_factory=dict, init=False, repr=False)
 
     def __post_init__(self) -> None:
         self.bsr = IgneaBSR()
@@ -490,17 +545,32 @@ class IgneaTreeToBSRConverter(IgneaTreeVisitor):
         if self.bsr.start is not None or len(self.bsr.epns) > 0:
             self.bsr = IgneaBSR()
 
+        self._strings.clear()
+
         self.bsr.start = (
             self.tree.type_,
             self.tree.start_position,
             self.tree.end_terminal.end_position,
         )
 
-        IgneaTreePositionUnfixer.get(self.tree).visit()
-
     def descend(self, node: IgneaTreeNode, _) -> IgneaTreeNode | None:
         if isinstance(node, IgneaNonterminalTreeNode):
+            # Unfixes the positions of the children as
+            # IgneaTreePositionUnfixer would, before they are descended
+            node.children[0].start_position = node.start_position
+
+            for previous, child in zip(node.children, node.children[1:]):
+                child.start_position = previous.end_terminal.end_position
+
             string = tuple(child.type_ for child in node.children)
+            prefixes = self._strings.get(string)
+
+            if prefixes is None:
+                # Every prefix of the string, itself included
+                prefixes = tuple(string[:i] for i in range(1, len(string))) + (string,)
+                self._strings[string] = prefixes
+
+            string = prefixes[-1]
             epn = IgneaEPN(
                 node.type_,
                 IgneaParsingState(
@@ -516,14 +586,16 @@ class IgneaTreeToBSRConverter(IgneaTreeVisitor):
             )
             self.bsr.add(epn)
 
-            for i in range(len(node.children) - 1):
+            start_position = node.start_position
+
+            for prefix, child in zip(prefixes, node.children[:-1]):
                 epn = IgneaEPN(
                     None,
                     IgneaParsingState(
-                        string[: i + 1],
-                        node.start_position,
-                        node.children[i].start_position,
-                        node.children[i].end_terminal,
+                        prefix,
+                        start_position,
+                        child.start_position,
+                        child.end_terminal,
                     ),
                 )
                 self.bsr.add(epn)
@@ -531,8 +603,15 @@ class IgneaTreeToBSRConverter(IgneaTreeVisitor):
         return node
 
     def bottom(self) -> bool:
-        IgneaTreePositionFixer.get(self.tree).visit()
-        return False
+        return True
+
+    def ascend(self, node: IgneaTreeNode, _) -> None:
+        # Fixes the positions back as IgneaTreePositionFixer would
+        if isinstance(node, IgneaNonterminalTreeNode):
+            node.start_position = node.children[0].start_position
+        else:
+            assert isinstance(node, IgneaTerminalTreeNode)
+            node.start_position = node.end_terminal.start_position
 
 
 class IgneaSemanticError(IgneaError):
@@ -15,13 +15,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from collections.abc import Iterator
+from collections.abc import Iterator, KeysView, ValuesView
 from dataclasses import dataclass, field
+import sys
+from typing import Any, ClassVar
 
 from ..common import IgneaPosition
 from .common import IgneaSemanticError
 
 
+# Not slotted, since dataclass subclasses of a slotted class would not
+# initialize the inherited defaults of fields excluded from __init__
 @dataclass
 class IgneaSymbol[T]:
     definition: T | None = field(default=None, init=False)
@@ -29,62 +33,150 @@ class IgneaSymbol[T]:
     references: list[T] = field(default_factory=list, init=False)
 
     def __repr__(self) -> str:
-        return repr((self.definition, self.declarations, self.references))
+        return f"({self.definition!r}, {self.declarations!r}, {self.references!r})"
 
 
+# Not slotted, so subclasses can add fields freely, as for IgneaSymbol
 @dataclass
 class IgneaSymbolTable[T]:
+    # Bumped whenever any table is reparented, so every table relinks to the
+    # version of its parent before its next lookup
+    _relinks: ClassVar[int] = 0
     parent: "IgneaSymbolTable[T] | None" = None
+    # Must only be changed through the methods below, which keep the
+    # lookup caches of the chain valid
     symbols: dict[str, IgneaSymbol[T]] = field(
         default_factory=dict, init=False, repr=False
     )
+    # Shared by all tables under the same root and bumped whenever any of
+    # them changes, so changes to other trees keep their lookup caches
+    _version: list[int] = field(init=False, repr=False, compare=False)
+    _version_relinks: int = field(init=False, repr=False, compare=False)
+    # Tables where names were found, so it never outgrows the chain
+    _lookup_cache: dict[str, "IgneaSymbolTable[T]"] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _lookup_version: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._version = (
+            self.parent._linked_version() if self.parent is not None else [0]
+        )
+        self._version_relinks = IgneaSymbolTable._relinks
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+
+        # Reparented after initialization, so the tables under this one
+        # must relink to the version of their new tree
+        if name == "parent" and hasattr(self, "_version"):
+            IgneaSymbolTable._relinks += 1
+
+    def _linked_version(self) -> list[int]:
+        relinks = IgneaSymbolTable._relinks
+
+        if self._version_relinks == relinks:
+            return self._version
+
+        # Relinks from the nearest linked ancestor or the root down, dropping
+        # the lookup caches since their chains may have changed
+        stale: list[IgneaSymbolTable[T]] = []
+        table = self
+
+        while table._version_relinks != relinks:
+            stale.append(table)
+
+            if table.parent is None:
+                break
+
+            table = table.parent
+
+        version = table._version
+
+        for table in reversed(stale):
+            table._version = version
+            table._version_relinks = relinks
+            table._lookup_version = -1
+
+        return version
 
     def __iter__(self) -> Iterator[tuple[str, IgneaSymbol[T]]]:
         return iter(self.symbols.items())
 
+    def names(self) -> KeysView[str]:
+        return self.symbols.keys()
+
+    def values(self) -> ValuesView[IgneaSymbol[T]]:
+        return self.symbols.values()
+
+    def clear(self) -> None:
+        self.symbols.clear()
+        self._linked_version()[0] += 1
+
     def add_get(
         self,
         name: str,
         shadow: bool = False,
         type_: type[IgneaSymbol[T]] = IgneaSymbol[T],
     ) -> IgneaSymbol[T]:
-        table: IgneaSymbolTable[T] | None = self
+        name = sys.intern(name)
+        symbol = self.symbols.get(name)
 
-        if name not in self.symbols and (
-            shadow or self.parent is None or (table := self.parent.table(name)) is None
-        ):
-            symbol = type_()
-            self.symbols[name] = symbol
+        if symbol is not None:
             return symbol
 
-        assert table is not None
-        return table.symbols[name]
+        if not shadow and self.parent is not None:
+            table = self.parent.table(name)
+
+            if table is not None:
+                return table.symbols[name]
+
+        symbol = type_()
+        self.symbols[name] = symbol
+        self._linked_version()[0] += 1
+        return symbol
 
     def table(self, name: str) -> "IgneaSymbolTable[T] | None":
-        if name in self.symbols:
-            return self
+        name = sys.intern(name)
+        version = (
+            self._version
+            if self._version_relinks == IgneaSymbolTable._relinks
+            else self._linked_version()
+        )[0]
+
+        if self._lookup_version != version:
+            self._lookup_cache.clear()
+            self._lookup_version = version
+        else:
+            cached = self._lookup_cache.get(name)
+
+            if cached is not None:
+                return cached
 
-        if self.parent is None:
-            return None
+        table: IgneaSymbolTable[T] | None = self
 
-        return self.parent.table(name)
+        while table is not None and name not in table.symbols:
+            table = table.parent
+
+        if table is not None:
+            self._lookup_cache[name] = table
+
+        return table
 
 
 class IgneaDuplicateSymbolDefinitionError(IgneaSemanticError):
+    _TEMPLATE = "Duplicate definition of symbol '{}', first defined at {}.".format
+
     def __init__(
         self, position: IgneaPosition, name: str, first_position: IgneaPosition
     ) -> None:
-        super().__init__(
-            position,
-            f"Duplicate definition of symbol '{name}', first defined at {first_position}.",
-        )
+        super().__init__(position, self._TEMPLATE(name, first_position))
 
 
 class IgneaUndefinedSymbolError(IgneaSemanticError):
+    _TEMPLATE = "Undefined symbol '{}', first referenced at {}.".format
+
     def __init__(
         self, position: IgneaPosition, name: str, first_position: IgneaPosition
     ) -> None:
-        super().__init__(
-            position,
-            f"Undefined symbol '{name}', first referenced at {first_position}.",
-        )
+        super().__init__(position, self._TEMPLATE(name, first_position))
@@ -19,7 +19,7 @@
 """Syntactic analysis library for the Ignea front-end."""
 
 from dataclasses import dataclass, field
-from typing import ClassVar, NamedTuple
+from typing import ClassVar, Literal, NamedTuple
 
 from .common import (
     IgneaConditions,
@@ -38,7 +38,8 @@ def ignea_compute_sccs[T](graph: dict[T, set[T]]) -> list[set[T]]:
     Tarjan's strongly connected components algorithm.
 
     This algorithm is used to detect left-recursions in a CFG and
-    separate recursion cycles as SCCs.
+    separate recursion cycles as SCCs. It is implemented with an
+    explicit stack, so large grammars do not hit the recursion limit.
 
     Args:
         graph: Mapping from a node to the nodes it points to.
@@ -49,13 +50,15 @@ def ignea_compute_sccs[T](graph: dict[T, set[T]]) -> list[set[T]]:
     # Index of visited nodes
     visited_index: dict[T, int] = {}
     # Smallest index in stack reachable from nodes
-    min_index = {}
-    stack = []
+    min_index: dict[T, int] = {}
+    stack: list[T] = []
+    # Nodes in stack, avoiding linear searches in it
+    on_stack: set[T] = set()
     sccs = []
 
-    def compute_scc(v: T) -> None:
+    def visit(v: T) -> None:
         """
-        Single recursive step of Tarjan's SCC algorithm visiting a node.
+        Visits a node, pushing it to the stack.
 
         Args:
             v: Node to visit.
@@ -65,31 +68,51 @@ def ignea_compute_sccs[T](graph: dict[T, set[T]]) -> list[set[T]]:
         min_index[v] = index
         visited_index[v] = index
         stack.append(v)
+        on_stack.add(v)
+
+    for root in graph:
+        if root in visited_index:
+            continue
+
+        visit(root)
+        # Nodes being visited, with the nodes they point to left to be
+        # processed, replacing recursion
+        work = [(root, iter(graph[root]))]
+
+        while len(work) > 0:
+            v, ws = work[-1]
+
+            for w in ws:
+                if w not in visited_index:
+                    visit(w)
+                    work.append((w, iter(graph[w])))
+                    break
+
+                if w in on_stack:
+                    min_index[v] = min(min_index[v], visited_index[w])
+                # If w is not in stack, (v, w) points to an SCC already
+                # found
+            else:
+                work.pop()
 
-        for w in graph[v]:
-            if w not in visited_index:
-                compute_scc(w)
-                min_index[v] = min(min_index[v], min_index[w])
-            elif w in stack:
-                min_index[v] = min(min_index[v], visited_index[w])
-            # If w is not in stack, (v, w) points to an SCC already
-            # found
-
-        # If v is a root node
-        if min_index[v] == index:
-            scc = set()
-            w = stack.pop()
-            scc.add(w)
+                # If v is a root node
+                if min_index[v] == visited_index[v]:
+                    scc = set()
+                    w = stack.pop()
+                    on_stack.discard(w)
+                    scc.add(w)
 
-            while w != v:
-                w = stack.pop()
-                scc.add(w)
+                    while w != v:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        scc.add(w)
 
-            sccs.append(scc)
+                    sccs.append(scc)
 
-    for v in graph:
-        if v not in visited_index:
-            compute_scc(v)
+                # Propagate to the node that visited v
+                if len(work) > 0:
+                    u = work[-1][0]
+                    min_index[u] = min(min_index[u], min_index[v])
 
     return sccs
 
@@ -103,8 +126,17 @@ class IgneaNonterminalType(metaclass=IgneaMeta):
     nonterminal type. It specifically includes the implementation of a
     recursive descent that recognizes the production rules associated
     with this nonterminal type.
+
+    Attributes:
+        _TERMINAL_TAG:
+            Always False, telling nonterminal types apart from terminal
+            tags without the cost of `issubclass` on the metaclass.
+            Its literal type makes mypy narrow a symbol that is a
+            terminal tag or a nonterminal type on checking it.
     """
 
+    _TERMINAL_TAG: ClassVar[Literal[False]] = False
+
     @staticmethod
     def start(conditions: IgneaConditions) -> bool:
         """
@@ -286,10 +318,12 @@ class IgneaBSR:
             ),
         )
 
-        if key not in self.epns:
-            self.epns[key] = set()
+        epns = self.epns.get(key)
 
-        self.epns[key].add(epn)
+        if epns is None:
+            self.epns[key] = {epn}
+        else:
+            epns.add(epn)
 
     def left_children(self, parent: IgneaEPN) -> set[IgneaEPN]:
         """
@@ -299,19 +333,17 @@ class IgneaBSR:
             parent: Parent EPN.
         """
 
-        key = (
-            parent.state.string[:-1],
-            parent.state.start_position,
-            parent.state.split_position,
-        )
-
-        if (
-            parent.state.start_position == parent.state.split_position
-            or key not in self.epns
-        ):
+        if parent.state.start_position == parent.state.split_position:
             return set()
 
-        return self.epns[key]
+        epns = self.epns.get(
+            (
+                parent.state.string[:-1],
+                parent.state.start_position,
+                parent.state.split_position,
+            )
+        )
+        return epns if epns is not None else set()
 
     def right_children(self, parent: IgneaEPN) -> set[IgneaEPN]:
         """
@@ -324,20 +356,20 @@ class IgneaBSR:
         if parent.state.end_terminal is None:
             return set()
 
-        key = (
-            parent.state.string[-1],
-            parent.state.split_position,
-            parent.state.end_terminal.end_position,
-        )
-
         if (
             parent.state.split_position == parent.state.end_terminal.end_position
-            or issubclass(parent.state.string[-1], IgneaTerminalTag)
-            or key not in self.epns
+            or parent.state.string[-1]._TERMINAL_TAG
         ):
             return set()
 
-        return self.epns[key]
+        epns = self.epns.get(
+            (
+                parent.state.string[-1],
+                parent.state.split_position,
+                parent.state.end_terminal.end_position,
+            )
+        )
+        return epns if epns is not None else set()
 
 
 @dataclass
@@ -370,6 +402,10 @@ class IgneaParser:
         _memo:
             Memoization of `IgneaNonterminalType.descend` for all
             nonterminal types included in syntactic analysis.
+        _strings:
+            Interned derivation strings of parsing states, so equal
+            strings share one tuple and compare by identity in BSR
+            keys.
     """
 
     NONTERMINAL_TYPES: ClassVar[list[type[IgneaNonterminalType]]]
@@ -387,6 +423,10 @@ class IgneaParser:
     _memo: dict[
         tuple[type[IgneaNonterminalType], IgneaPosition], set[IgneaTerminal]
     ] = field(default_factory=dict, init=False, repr=False)
+    _strings: dict[
+        tuple[type[IgneaTerminalTag | IgneaNonterminalType], ...],
+        tuple[type[IgneaTerminalTag | IgneaNonterminalType], ...],
+    ] = field(default_factory=dict, init=False, repr=False)
 
     def __post_init__(self) -> None:
         """
@@ -518,30 +558,38 @@ class IgneaParser:
 
         next_states = set()
 
-        if issubclass(cls, IgneaTerminalTag):
+        if cls._TERMINAL_TAG:
             for current_state in current_states:
                 next_state = self._derive_single_terminal_tag(cls, current_state)
 
                 if next_state is not None:
                     next_states.add(next_state)
         else:
-            assert issubclass(cls, IgneaNonterminalType)
-
             if not isinstance(ascend, bool):
                 # Determine at runtime if should ascend, preventing
                 # infinite recursion when both caller and callee
                 # belong to same left-recursion SCC
+                ascend_first = (
+                    self._nonterminal_types_first.get(ascend)
+                    if ascend is not None
+                    else None
+                )
                 ascend = (
-                    ascend is None
-                    or ascend not in self._nonterminal_types_first
-                    or cls not in self._nonterminal_types_first[ascend]
+                    ascend_first is None or cls not in ascend_first
                 ) and cls in self._nonterminal_types_first
 
             for current_state in current_states:
-                next_states |= self._derive_single_nonterminal_type(
+                states = self._derive_single_nonterminal_type(
                     cls, current_state, ascend
                 )
 
+                # Each call returns a new set, so the first one can be
+                # taken as is instead of copied
+                if len(next_states) == 0:
+                    next_states = states
+                else:
+                    next_states |= states
+
         if len(next_states) == 0:
             raise IgneaDerivationException()
 
@@ -570,30 +618,32 @@ class IgneaParser:
         self.bsr.add(IgneaEPN(None, current_state))
         next_terminal = self.lexer.next_terminal(current_state.end_terminal)
 
-        if next_terminal is not None and next_terminal != self._eoi:
-            if (
-                self._eoi is None
-                or next_terminal.start_position.index_ > self._eoi.start_position.index_
-            ):
-                self._eoi = next_terminal
-            elif next_terminal.start_position.index_ == self._eoi.start_position.index_:
-                eoi: IgneaTerminal | None = self._eoi
+        eoi: IgneaTerminal | None = self._eoi
+
+        if next_terminal is not None and next_terminal is not eoi:
+            index = next_terminal.start_position.index_
+            eoi_index = eoi.start_position.index_ if eoi is not None else -1
 
+            if index > eoi_index:
+                self._eoi = next_terminal
+            elif index == eoi_index:
                 while (
                     eoi is not None
-                    and next_terminal != eoi
-                    and next_terminal.start_position.index_ == eoi.start_position.index_
+                    and next_terminal is not eoi
+                    and index == eoi.start_position.index_
                 ):
                     eoi = eoi.next
 
-                if next_terminal == eoi:
+                if next_terminal is eoi:
                     self._eoi = next_terminal
 
         if next_terminal is None or cls not in next_terminal.tags:
             return None
 
+        string = current_state.string + (cls,)
+
         return IgneaParsingState(
-            current_state.string + (cls,),
+            self._strings.setdefault(string, string),
             current_state.start_position,
             (
                 current_state.end_terminal.end_position
@@ -634,11 +684,15 @@ class IgneaParser:
             else current_state.split_position
         )
 
-        if ascend or (cls, current_state_end_position) not in self._memo:
-            if (cls, current_state_end_position) not in self._memo:
-                self._memo[cls, current_state_end_position] = set()
+        # Looked up once, since the set is only ever updated in place
+        memo = self._memo.get((cls, current_state_end_position))
 
-            initial_memo_len = len(self._memo[cls, current_state_end_position])
+        if ascend or memo is None:
+            if memo is None:
+                memo = set()
+                self._memo[cls, current_state_end_position] = memo
+
+            initial_memo_len = len(memo)
 
             try:
                 next_states = cls.descend(
@@ -656,24 +710,23 @@ class IgneaParser:
                 for next_state in next_states:
                     self.bsr.add(IgneaEPN(cls, next_state))
                     assert next_state.end_terminal is not None
-                    self._memo[cls, current_state_end_position].add(
-                        next_state.end_terminal
-                    )
+                    memo.add(next_state.end_terminal)
 
                 # Only ascend if descent added states
-                if ascend and initial_memo_len != len(
-                    self._memo[cls, current_state_end_position]
-                ):
+                if ascend and initial_memo_len != len(memo):
                     cls.ascend(self, current_state)
 
+        string = current_state.string + (cls,)
+        string = self._strings.setdefault(string, string)
+
         return {
             IgneaParsingState(
-                current_state.string + (cls,),
+                string,
                 current_state.start_position,
                 current_state_end_position,
                 next_terminal,
             )
-            for next_terminal in self._memo[cls, current_state_end_position]
+            for next_terminal in memo
         }
 
 
@@ -18,7 +18,7 @@
 from argparse import ArgumentParser
 from os import path
 
-from ..common import IgneaExceptionHandler
+from ..common import ignea_exception_handler
 from ..semantic.common import IgneaBSRDisambiguator, IgneaBSRToTreeConverter
 from . import __version__
 from .common import Conditions
@@ -64,7 +64,7 @@ def main():
     ) as syntactic_file:
         syntactic_input = syntactic_file.read()
 
-    with IgneaExceptionHandler():
+    with ignea_exception_handler():
         lexical_lexer = Lexer(
             path.join(args.input, "lexical.aether"), lexical_input, Conditions.lexical
         )
@@ -75,7 +75,7 @@ class AetherCommonFileFold(AetherFileFold):
     def fold(self) -> str:
         conditions = []
 
-        for name, _ in self.symbol_table:
+        for name in self.symbol_table.names():
             conditions.append(self.fold_condition(name))
 
         return self.fold_file(conditions)
@@ -316,15 +316,7 @@ class AetherExpressionFold(IgneaTreeFold[str]):
         condition_fold_type: type[AetherConditionFold],
         first_references: set[IgneaTerminal],
     ) -> "AetherExpressionFold":
-        if cls._instance is None:
-            cls._instance = cls(tree, condition_fold_type, first_references)
-        else:
-            assert isinstance(cls._instance, AetherExpressionFold)
-            cls._instance.tree = tree
-            cls._instance.condition_fold_type = condition_fold_type
-            cls._instance.first_references = first_references
-
-        return cls._instance
+        return cls(tree, condition_fold_type, first_references)
 
     def fold_internal(
         self, node: IgneaNonterminalTreeNode, children: list[str]
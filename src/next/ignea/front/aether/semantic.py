@@ -431,8 +431,8 @@ class LexicalSymbolTableBuilder(IgneaTreeVisitor):
                     symbol.dedent = True
 
     def top_before(self) -> None:
-        self.condition_table.symbols.clear()
-        self.terminal_table.symbols.clear()
+        self.condition_table.clear()
+        self.terminal_table.clear()
 
     def descend(self, node: IgneaTreeNode, _) -> IgneaTreeNode | None:
         if isinstance(node, IgneaNonterminalTreeNode):
@@ -596,16 +596,7 @@ class SyntacticSymbolTableBuilder(IgneaTreeVisitor):
         condition_table: IgneaSymbolTable[IgneaNonterminalTreeNode],
         terminal_table: IgneaSymbolTable[IgneaNonterminalTreeNode],
     ) -> "SyntacticSymbolTableBuilder":
-        if cls._instance is None:
-            cls._instance = cls(tree, condition_table, terminal_table)
-        else:
-            assert isinstance(cls._instance, SyntacticSymbolTableBuilder)
-            cls._instance.tree = tree
-            cls._instance.condition_table = condition_table
-            cls._instance.terminal_table = terminal_table
-            cls._instance.nonterminal_table.parent = terminal_table
-
-        return cls._instance
+        return cls(tree, condition_table, terminal_table)
 
     def __post_init__(self) -> None:
         self.nonterminal_table = IgneaSymbolTable[IgneaNonterminalTreeNode](
@@ -613,7 +604,7 @@ class SyntacticSymbolTableBuilder(IgneaTreeVisitor):
         )
 
     def top_before(self) -> None:
-        self.nonterminal_table.symbols.clear()
+        self.nonterminal_table.clear()
 
     def descend(self, node: IgneaTreeNode, _) -> IgneaTreeNode | None:
         if isinstance(node, IgneaNonterminalTreeNode):